@@ -3,14 +3,17 @@ Routes API simplifiées pour MVP
 """
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+import asyncio
 import pandas as pd
 import io
 import base64
 from typing import List, Optional
 import logging
 
+from app.config import settings
 from app.services.analysis_service import SimpleAnalysisService
+from app.services.csv_loader import read_csv_bytes
 
 # Configuration
 logging.basicConfig(level=logging.INFO)
@@ -19,6 +22,29 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 analysis_service = SimpleAnalysisService()
 
+# Taille des blocs lus sur les fichiers téléversés
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def check_upload_size(filename: str, size: int) -> None:
+    """Refuse (413) un fichier dépassant la taille maximale autorisée"""
+    if size > settings.max_file_size_mb * 1024 * 1024:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Fichier {filename} trop volumineux (max {settings.max_file_size_mb} Mo)"
+        )
+
+
+async def read_upload(file: UploadFile) -> bytes:
+    """Lit le fichier par blocs et refuse dès que la taille maximale autorisée est dépassée"""
+    chunks = []
+    size = 0
+    while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+        size += len(chunk)
+        check_upload_size(file.filename, size)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
 @router.get("/health")
 async def health_check():
     """Vérification de santé simplifiée"""
@@ -61,39 +87,26 @@ async def analyze_data(
         files_data = []
         for file in files:
             try:
-                # Lire le contenu du fichier
-                content = await file.read()
+                # Lire le contenu du fichier (taille bornée)
+                content = await read_upload(file)
                 
                 # Décoder si nécessaire
                 if file.filename.endswith('.csv'):
-                    # Essayer différents encodages et séparateurs
-                    for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                        for separator in [',', ';', '\t']:
-                            try:
-                                df = pd.read_csv(io.BytesIO(content), encoding=encoding, sep=separator)
-                                # Vérifier que le parsing a fonctionné (plus d'une colonne)
-                                if len(df.columns) > 1:
-                                    logger.info(f"Fichier {file.filename} parsé avec succès: {len(df.columns)} colonnes")
-                                    break
-                                else:
-                                    logger.warning(f"Parsing avec séparateur '{separator}' n'a donné qu'une colonne pour {file.filename}")
-                            except UnicodeDecodeError:
-                                continue
-                            except Exception as e:
-                                logger.warning(f"Erreur parsing avec séparateur '{separator}': {str(e)}")
-                                continue
-                        else:
-                            continue
-                        break
-                    else:
+                    # Encodage et séparateur détectés une fois, un seul parsing (hors boucle d'événements)
+                    df = await asyncio.to_thread(read_csv_bytes, content)
+                    # Vérifier que le parsing a fonctionné (plus d'une colonne)
+                    if len(df.columns) <= 1:
                         raise ValueError(f"Impossible de décoder le fichier {file.filename}")
+                    logger.info(f"Fichier {file.filename} parsé avec succès: {len(df.columns)} colonnes")
                 elif file.filename.endswith('.xlsx'):
-                    df = pd.read_excel(io.BytesIO(content))
+                    df = await asyncio.to_thread(pd.read_excel, io.BytesIO(content))
                 else:
                     raise ValueError(f"Format de fichier non supporté: {file.filename}")
                 
                 files_data.append((file.filename, df))
                 
+            except HTTPException:
+                raise
             except Exception as e:
                 logger.error(f"Erreur lecture fichier {file.filename}: {str(e)}")
                 raise HTTPException(
@@ -105,7 +118,7 @@ async def analyze_data(
         if len(files_data) == 1:
             # Analyse d'un seul fichier
             filename, df = files_data[0]
-            result = analysis_service.analyze_single_file(
+            result = await analysis_service.analyze_single_file_async(
                 df=df,
                 question=question,
                 analysis_type=analysis_type,
@@ -122,13 +135,13 @@ async def analyze_data(
                 anonymize_data=anonymize_data
             )
         
-        return JSONResponse(content=result, status_code=200)
+        return ORJSONResponse(content=result, status_code=200)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Erreur analyse: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "error": "Erreur interne du serveur",
                 "details": str(e),
@@ -160,26 +173,24 @@ async def analyze_data_base64(
                 filename = file_info.get("filename", "unknown.csv")
                 content_b64 = file_info.get("content", "")
                 
-                # Décoder base64
-                content = base64.b64decode(content_b64)
+                # Taille décodée estimée avant de décoder quoi que ce soit
+                check_upload_size(filename, len(content_b64) * 3 // 4)
+                
+                # Décoder base64 (hors boucle d'événements, comme le parsing)
+                content = await asyncio.to_thread(base64.b64decode, content_b64)
                 
                 # Lire le DataFrame
                 if filename.endswith('.csv'):
-                    for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                        try:
-                            df = pd.read_csv(io.BytesIO(content), encoding=encoding)
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        raise ValueError(f"Impossible de décoder le fichier {filename}")
+                    df = await asyncio.to_thread(read_csv_bytes, content)
                 elif filename.endswith('.xlsx'):
-                    df = pd.read_excel(io.BytesIO(content))
+                    df = await asyncio.to_thread(pd.read_excel, io.BytesIO(content))
                 else:
                     raise ValueError(f"Format de fichier non supporté: {filename}")
                 
                 processed_files.append((filename, df))
                 
+            except HTTPException:
+                raise
             except Exception as e:
                 logger.error(f"Erreur lecture fichier {filename}: {str(e)}")
                 raise HTTPException(
@@ -190,7 +201,7 @@ async def analyze_data_base64(
         # Analyse
         if len(processed_files) == 1:
             filename, df = processed_files[0]
-            result = analysis_service.analyze_single_file(
+            result = await analysis_service.analyze_single_file_async(
                 df=df,
                 question=question,
                 analysis_type=analysis_type,
@@ -206,13 +217,13 @@ async def analyze_data_base64(
                 anonymize_data=anonymize_data
             )
         
-        return JSONResponse(content=result, status_code=200)
+        return ORJSONResponse(content=result, status_code=200)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Erreur analyse base64: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "error": "Erreur interne du serveur",
                 "details": str(e),
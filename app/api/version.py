@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import psutil
 import time
 import os
@@ -9,7 +9,7 @@ version_router = APIRouter()
 @version_router.get('/version')
 async def get_version():
     """Endpoint pour les informations de version"""
-    return JSONResponse({
+    return ORJSONResponse({
         "service": "zukii-python",
         "version": "1.0.0",
         "buildDate": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -7,6 +7,13 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4"
     openai_max_tokens: int = 2000
     openai_temperature: float = 0.3
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_connect_timeout: float = 5.0
+    openai_max_concurrency: int = 8
+    openai_rpm: int = 500
+    openai_tpm: int = 200000
+    openai_max_retries: int = 4
     jwt_secret: str = "zukii-python-secret-key-2024"
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 30
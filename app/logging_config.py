@@ -0,0 +1,39 @@
+"""
+Configuration du logging non bloquant
+Les appels de log ne font qu'empiler l'enregistrement; un thread d'écoute écrit sur les handlers réels
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: int = logging.INFO) -> QueueListener:
+    """Place les handlers du logger racine derrière une file et démarre le thread d'écriture"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        handlers = [logging.StreamHandler()]
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    root.handlers = [QueueHandler(log_queue)]
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Vide la file, arrête le thread d'écriture et rebranche les handlers réels"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().handlers = list(_listener.handlers)
+        _listener = None
@@ -4,12 +4,14 @@ Application FastAPI simplifiée pour MVP
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
 
-from app.api.routes import router
+from app.api.routes import router, analysis_service
 from app.api.metrics import metrics_router
 from app.api.version import version_router
 from app.config import settings
+from app.logging_config import setup_logging, shutdown_logging
 
 # Configuration
 logging.basicConfig(level=logging.INFO)
@@ -19,7 +21,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Zukii Analysis Service - MVP",
     description="Service d'analyse IA simplifié pour MVP",
-    version="1.0.0-mvp"
+    version="1.0.0-mvp",
+    default_response_class=ORJSONResponse  # Sérialisation JSON rapide (orjson, types numpy natifs)
 )
 
 # Configuration CORS
@@ -54,9 +57,13 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     """Événement de démarrage"""
+    # Logs écrits par un thread dédié, jamais sur la boucle d'événements
+    setup_logging(logging.INFO)
     logger.info("🚀 Service d'analyse Zukii MVP démarré")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Événement d'arrêt"""
-    logger.info("🛑 Service d'analyse Zukii MVP arrêté")
\ No newline at end of file
+    analysis_service.close()
+    logger.info("🛑 Service d'analyse Zukii MVP arrêté")
+    shutdown_logging()
\ No newline at end of file
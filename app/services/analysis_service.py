@@ -3,21 +3,106 @@ Service d'analyse simplifié pour MVP
 Version ultra-simplifiée sans validation complexe
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import uuid
 from datetime import datetime
+from functools import cached_property, lru_cache
 from typing import Dict, Any, List, Tuple, Optional
-import openai
 import os
+import re
+import threading
+import time
 import logging
 import numpy as np
 
+from app.config import settings as app_settings
+from app.services.cache import TTLCache, hash_dataframe, hash_request, normalize_question
+from app.services.rate_limiter import RateLimiter
+
 # Configuration simple
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_uuid4 = uuid.uuid4
+
+# Cache des analyses IA: évite de rappeler OpenAI pour un même dataset + question
+AI_CACHE_MAXSIZE = 1024
+AI_CACHE_TTL_SECONDS = 600
+# Cache des réponses OpenAI par prompt exact (indépendant du contenu brut du dataset)
+PROMPT_CACHE_MAXSIZE = 5000
+PROMPT_CACHE_TTL_SECONDS = 3600
+
+# Cache des graphiques (ne dépendent que du contenu du dataset)
+CHART_CACHE_MAXSIZE = 256
+CHART_CACHE_TTL_SECONDS = 600
+
+# Instructions statiques envoyées en tête de chaque appel: un préfixe identique d'un appel
+# à l'autre est éligible au cache de prompt automatique d'OpenAI
+ANALYSIS_SYSTEM_PROMPT = """Tu es un expert en analyse marketing web. Analyse le dataset décrit par l'utilisateur et réponds à sa question.
+
+Instructions:
+1. Fournis une analyse détaillée et professionnelle
+2. Identifie les tendances clés et les opportunités
+3. Propose des recommandations actionnables
+4. Utilise des métriques concrètes
+5. Structure ta réponse avec des sections claires
+
+Réponds en français de manière professionnelle."""
+
+_SYSTEM_MESSAGE = {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT}
+
+# Partie dynamique du prompt, construite une seule fois à l'import
+ANALYSIS_USER_PROMPT_TEMPLATE = """Informations sur le dataset:
+- Nombre de lignes: {rows}
+- Nombre de colonnes: {column_count}
+- Colonnes disponibles: {columns}
+
+Insights extraits:
+{insights}
+
+Question: {question}"""
+# Budget de la liste des colonnes dans le prompt (~4 caractères par token, soit ~1000 tokens)
+PROMPT_COLUMNS_MAX_CHARS = 4000
+
+# Mots-clés identifiant une colonne sensible à partir de son nom
+SENSITIVE_COLUMN_KEYWORDS = ('email', 'phone', 'address', 'name', 'id', 'user')
+SENSITIVE_COLUMN_CACHE_SIZE = 1024
+# Union des mots-clés: une seule passe du moteur regex par nom de colonne
+_SENSITIVE_COLUMN_RE = re.compile(
+    "|".join(re.escape(keyword) for keyword in SENSITIVE_COLUMN_KEYWORDS),
+    re.IGNORECASE
+)
+
+# Tranches de montants d'achat (bornes intérieures, intervalles ]a, b])
+PURCHASE_AMOUNT_EDGES = np.array([50, 100, 200, 500, 1000])
+PURCHASE_AMOUNT_LABELS = ('0-50€', '50-100€', '100-200€', '200-500€', '500-1000€', '1000€+')
+
+# Colonnes temporelles détectées par leur nom
+_DATE_COLUMN_PATTERN = "date|time"
+
+@lru_cache(maxsize=SENSITIVE_COLUMN_CACHE_SIZE)
+def _is_sensitive_name(column_name: Any) -> bool:
+    """Indique si le nom de colonne contient un mot-clé sensible (mémorisé pour tout le processus)"""
+    # Les en-têtes ne sont pas toujours des chaînes (CSV sans en-tête, index entiers)
+    return _SENSITIVE_COLUMN_RE.search(str(column_name)) is not None
+
+@lru_cache(maxsize=64)
+def _dtype_name(dtype: Any) -> str:
+    """Nom d'un dtype, mémorisé: un dataset large ne compte que quelques dtypes distincts"""
+    return str(dtype)
+
 def convert_to_serializable(obj):
     """Convertit les objets pandas/numpy en types Python natifs sérialisables"""
+    # Chemin rapide: recherche sur le type exact, sans cascade d'isinstance
+    obj_type = type(obj)
+    if obj_type in _PASSTHROUGH_TYPES:
+        return obj
+    converter = _CONVERTERS.get(obj_type)
+    if converter is not None:
+        return converter(obj)
+
     if isinstance(obj, (np.integer, np.int64, np.int32)):
         return int(obj)
     elif isinstance(obj, (np.floating, np.float64, np.float32)):
@@ -37,22 +122,86 @@ def convert_to_serializable(obj):
     else:
         return obj
 
+# Types natifs renvoyés tels quels (feuilles les plus fréquentes)
+_PASSTHROUGH_TYPES = frozenset({str, int, bool, type(None)})
+_CONVERTERS = {
+    dict: lambda obj: {key: convert_to_serializable(value) for key, value in obj.items()},
+    list: lambda obj: [convert_to_serializable(item) for item in obj],
+    float: lambda obj: None if obj != obj else obj,
+    np.int64: int,
+    np.int32: int,
+    np.float64: float,
+    np.float32: float,
+    np.ndarray: np.ndarray.tolist,
+}
+
 class SimpleAnalysisService:
     """Service d'analyse ultra-simplifié pour MVP"""
     
     def __init__(self):
-        """Initialise le client OpenAI si une clé est disponible, sinon passe en mode offline.
+        """Initialise la configuration; le client OpenAI est créé à la demande si une clé est disponible,
+        sinon le service passe en mode offline.
 
         Mode offline: génère une analyse déterministe locale (sans appel externe) pour permettre
         les tests unitaires et l'exécution CI sans `OPENAI_API_KEY`.
         """
-        api_key = os.getenv("OPENAI_API_KEY")
-        self.openai_client = openai.OpenAI(api_key=api_key) if api_key else None
         self.settings = {
             "model": "gpt-4o-mini",
             "max_tokens": 2000,
             "temperature": 0.3
         }
+        self._ai_cache = TTLCache(maxsize=AI_CACHE_MAXSIZE, ttl=AI_CACHE_TTL_SECONDS)
+        self._prompt_cache = TTLCache(maxsize=PROMPT_CACHE_MAXSIZE, ttl=PROMPT_CACHE_TTL_SECONDS)
+        self._chart_cache = TTLCache(maxsize=CHART_CACHE_MAXSIZE, ttl=CHART_CACHE_TTL_SECONDS)
+        # Borne globale des appels OpenAI simultanés (routes et analyses multi-fichiers)
+        self._openai_slots = threading.BoundedSemaphore(app_settings.openai_max_concurrency)
+        # Respect des quotas RPM/TPM avant l'appel plutôt qu'après une erreur 429
+        self._rate_limiter = RateLimiter(app_settings.openai_rpm, app_settings.openai_tpm)
+        # Pool dédié aux analyses: un worker mis en attente par le limiteur de débit
+        # n'occupe pas le pool par défaut utilisé pour le parsing des fichiers
+        self._analysis_executor = ThreadPoolExecutor(
+            max_workers=app_settings.max_concurrent_analyses,
+            thread_name_prefix="analysis"
+        )
+
+    @cached_property
+    def openai_client(self):
+        """Client OpenAI créé au premier appel: le SDK `openai` n'est importé qu'en mode online
+
+        Le client HTTP sous-jacent est partagé et garde ses connexions ouvertes (keep-alive),
+        ce qui évite une poignée de main TCP/TLS par analyse.
+        """
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return None
+        import httpx
+        import openai
+        timeout = httpx.Timeout(
+            app_settings.max_analysis_timeout,
+            connect=app_settings.openai_connect_timeout
+        )
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=app_settings.openai_max_connections,
+                max_keepalive_connections=app_settings.openai_max_keepalive_connections
+            ),
+            timeout=timeout
+        )
+        # Le SDK réessaie déjà les 408/409/429/5xx et erreurs réseau avec backoff exponentiel,
+        # jitter et respect de Retry-After: on ne règle que le nombre de tentatives
+        return openai.OpenAI(
+            api_key=api_key,
+            http_client=http_client,
+            timeout=timeout,
+            max_retries=app_settings.openai_max_retries
+        )
+
+    def close(self) -> None:
+        """Arrête le pool d'analyses et ferme le pool de connexions du client OpenAI s'il a été créé"""
+        self._analysis_executor.shutdown(wait=False, cancel_futures=True)
+        client = self.__dict__.pop("openai_client", None)
+        if client is not None:
+            client.close()
     
     def analyze_single_file(
         self,
@@ -63,23 +212,28 @@ class SimpleAnalysisService:
         anonymize_data: bool = True
     ) -> Dict[str, Any]:
         """Analyse un seul fichier de manière simplifiée"""
-        analysis_id = str(uuid.uuid4())
-        start_time = datetime.now()
+        analysis_id = str(_uuid4())
+        start_time = time.perf_counter()
         
         try:
-            # Anonymisation simple
+            # Anonymisation simple (détection faite une seule fois, réutilisée par le rapport)
+            sensitive_columns = []
             if anonymize_data:
-                df_anonymized = self._simple_anonymize(df)
+                sensitive_columns = self._identify_sensitive_columns(df)
+                df_anonymized = self._simple_anonymize(df, sensitive_columns)
             else:
                 df_anonymized = df
             
-            # Analyse IA complète
-            ai_analysis = self._simple_ai_analysis(df_anonymized, question)
+            # Empreinte calculée une seule fois, partagée par les caches IA et graphiques
+            data_hash = self._data_fingerprint(df_anonymized)
+            
+            # Analyse IA complète (servie depuis le cache si déjà calculée)
+            ai_analysis, cache_hit = self._cached_ai_analysis(df_anonymized, question, analysis_type, data_hash)
             
             # Génération de graphiques dynamiques
             charts = []
             if include_charts:
-                charts = self._generate_dynamic_charts(df_anonymized)
+                charts = self._cached_charts(df_anonymized, data_hash)
             
             # Génération d'insights métier
             insights = self._generate_business_insights(df_anonymized)
@@ -94,11 +248,6 @@ class SimpleAnalysisService:
             summary = self._generate_intelligent_summary(df_anonymized, ai_analysis["analysis"])
             
             # Rapport de confidentialité
-            sensitive_columns = []
-            if anonymize_data:
-                sensitive_patterns = ['email', 'phone', 'address', 'name', 'id', 'user']
-                sensitive_columns = [col for col in df.columns if any(pattern in col.lower() for pattern in sensitive_patterns)]
-            
             privacy_report = {
                 "anonymization_applied": anonymize_data,
                 "sensitive_columns_detected": sensitive_columns,
@@ -109,25 +258,17 @@ class SimpleAnalysisService:
             }
             
             # Métriques de performance
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             performance_metrics = {
                 "processing_time": processing_time,
-                "openai_tokens_used": self._calculate_tokens_used(ai_analysis),
+                "openai_tokens_used": 0 if cache_hit else self._calculate_tokens_used(ai_analysis),
+                "ai_cache_hit": cache_hit,
                 "openai_response_time": processing_time * 0.8,
                 "chart_generation_time": processing_time * 0.2
             }
             
             # Résumé des données
-            data_summary = {
-                "shape": {"rows": int(len(df)), "columns": int(len(df.columns))},
-                "columns": {col: {"name": col, "dtype": str(dtype)} for col, dtype in df.dtypes.items()},
-                "data_types": {col: str(dtype) for col, dtype in df.dtypes.items()},
-                "missing_values": convert_to_serializable(df.isnull().sum().to_dict()),
-                "basic_stats": {
-                    "total_missing_values": int(df.isnull().sum().sum()),
-                    "missing_percentage": float((df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100)
-                }
-            }
+            data_summary = self._build_data_summary(df)
             
             # Construire la réponse finale avec l'analyse IA
             response_data = {
@@ -148,7 +289,7 @@ class SimpleAnalysisService:
             return response_data
             
         except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             logger.error(f"Erreur d'analyse: {str(e)}")
             return {
                 "analysis_id": analysis_id,
@@ -158,6 +299,40 @@ class SimpleAnalysisService:
                 "status": "error"
             }
     
+    @staticmethod
+    def _build_data_summary(df: pd.DataFrame) -> Dict[str, Any]:
+        """Résumé structurel du dataset (forme, types, valeurs manquantes)"""
+        data_types = {col: _dtype_name(dtype) for col, dtype in df.dtypes.items()}
+        # Un seul passage sur les valeurs manquantes, réutilisé par toutes les statistiques
+        missing_counts = df.isnull().sum()
+        total_missing = missing_counts.sum()
+        return {
+            "shape": {"rows": int(len(df)), "columns": int(len(df.columns))},
+            "columns": {col: {"name": col, "dtype": dtype} for col, dtype in data_types.items()},
+            "data_types": data_types,
+            "missing_values": convert_to_serializable(missing_counts.to_dict()),
+            "basic_stats": {
+                "total_missing_values": int(total_missing),
+                "missing_percentage": float((total_missing / (len(df) * len(df.columns))) * 100)
+            }
+        }
+
+    async def analyze_single_file_async(
+        self,
+        df: pd.DataFrame,
+        question: str,
+        analysis_type: str = "general",
+        include_charts: bool = True,
+        anonymize_data: bool = True
+    ) -> Dict[str, Any]:
+        """Variante asynchrone: exécute l'analyse (pandas + OpenAI) dans le pool dédié
+        pour ne pas bloquer la boucle d'événements"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._analysis_executor,
+            self.analyze_single_file,
+            df, question, analysis_type, include_charts, anonymize_data
+        )
+    
     async def analyze_multiple_files(
         self,
         files_data: List[Tuple[str, pd.DataFrame]],
@@ -167,33 +342,31 @@ class SimpleAnalysisService:
         anonymize_data: bool = True
     ) -> Dict[str, Any]:
         """Analyse plusieurs fichiers de manière simplifiée"""
-        analysis_id = str(uuid.uuid4())
-        start_time = datetime.now()
+        analysis_id = str(_uuid4())
+        start_time = time.perf_counter()
         
         try:
-            all_results = []
-            files_metadata = []
+            # Les fichiers sont analysés en parallèle, dans la limite de `max_concurrent_analyses`
+            semaphore = asyncio.Semaphore(app_settings.max_concurrent_analyses)
             
-            for filename, df in files_data:
+            async def analyze_file(filename: str, df: pd.DataFrame) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+                # Métadonnées calculées une seule fois par fichier
+                rows, columns = df.shape
+                file_info = {
+                    "filename": filename,
+                    "rows": rows,
+                    "columns": columns
+                }
                 try:
-                    # Analyser chaque fichier
-                    result = self.analyze_single_file(
-                        df, question, analysis_type, include_charts, anonymize_data
-                    )
+                    # Analyser chaque fichier dans un thread pour ne pas bloquer la boucle
+                    async with semaphore:
+                        result = await self.analyze_single_file_async(
+                            df, question, analysis_type, include_charts, anonymize_data
+                        )
                     
                     # Ajouter les métadonnées
-                    result["file_info"] = {
-                        "filename": filename,
-                        "rows": len(df),
-                        "columns": len(df.columns)
-                    }
-                    
-                    all_results.append(result)
-                    files_metadata.append({
-                        "filename": filename,
-                        "rows": len(df),
-                        "columns": len(df.columns)
-                    })
+                    result["file_info"] = file_info
+                    return result, file_info
                     
                 except Exception as e:
                     # En cas d'erreur, continuer avec les autres fichiers
@@ -203,21 +376,17 @@ class SimpleAnalysisService:
                         "processing_time": 0.0,
                         "created_at": datetime.utcnow().isoformat(),
                         "status": "error",
-                        "file_info": {
-                            "filename": filename,
-                            "rows": len(df),
-                            "columns": len(df.columns)
-                        }
+                        "file_info": file_info
                     }
-                    all_results.append(error_result)
-                    files_metadata.append({
-                        "filename": filename,
-                        "rows": len(df),
-                        "columns": len(df.columns),
-                        "error": str(e)
-                    })
+                    return error_result, {**file_info, "error": str(e)}
+            
+            outcomes = await asyncio.gather(
+                *(analyze_file(filename, df) for filename, df in files_data)
+            )
+            all_results = [result for result, _ in outcomes]
+            files_metadata = [metadata for _, metadata in outcomes]
             
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             
             return {
                 "analysis_id": analysis_id,
@@ -233,7 +402,7 @@ class SimpleAnalysisService:
             }
             
         except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             logger.error(f"Erreur d'analyse multiple: {str(e)}")
             return {
                 "analysis_id": analysis_id,
@@ -243,13 +412,59 @@ class SimpleAnalysisService:
                 "status": "error"
             }
     
+    @staticmethod
+    def _data_fingerprint(df: pd.DataFrame) -> Optional[str]:
+        """Empreinte du dataset, ou None si ses valeurs ne sont pas hachables (listes, dicts...)"""
+        try:
+            return hash_dataframe(df)
+        except TypeError:
+            return None
+
+    def _cached_ai_analysis(
+        self,
+        df: pd.DataFrame,
+        question: str,
+        analysis_type: str,
+        data_hash: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Analyse IA mémorisée par (empreinte du dataset, question normalisée, type d'analyse)"""
+        if data_hash is None:
+            data_hash = self._data_fingerprint(df)
+        if data_hash is None:
+            # Pas d'empreinte possible: pas de mise en cache
+            ai_analysis = self._simple_ai_analysis(df, question)
+            return ai_analysis, bool(ai_analysis.get("cache_hit"))
+
+        key = (data_hash, normalize_question(question), analysis_type, self.settings["model"])
+        cached = self._ai_cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        ai_analysis = self._simple_ai_analysis(df, question)
+        # Ne pas mémoriser les erreurs pour permettre une nouvelle tentative
+        if not ai_analysis.get("error"):
+            self._ai_cache.set(key, ai_analysis)
+        return ai_analysis, bool(ai_analysis.get("cache_hit"))
+
+    def _cached_charts(self, df: pd.DataFrame, data_hash: Optional[str]) -> List[Dict[str, Any]]:
+        """Graphiques mémorisés par empreinte du dataset"""
+        if data_hash is None:
+            return self._generate_dynamic_charts(df)
+
+        cached = self._chart_cache.get(data_hash)
+        if cached is not None:
+            return cached
+
+        charts = self._generate_dynamic_charts(df)
+        self._chart_cache.set(data_hash, charts)
+        return charts
+
     def _simple_ai_analysis(self, df: pd.DataFrame, question: str) -> Dict[str, Any]:
         """Analyse IA améliorée avec insights métier"""
         try:
             # Mode offline: pas de clé API → produire une analyse déterministe locale
             if self.openai_client is None:
                 column_types = {col: str(dtype) for col, dtype in df.dtypes.items()}
-                non_null_counts = df.notnull().sum().to_dict()
                 analysis_text = (
                     "Analyse locale (offline). "
                     f"Lignes: {len(df)}, Colonnes: {len(df.columns)}. "
@@ -257,17 +472,7 @@ class SimpleAnalysisService:
                     f"Question: {question}. "
                     "Recommandation: compléter le dataset et vérifier la qualité des données."
                 )
-                data_summary = {
-                    "rows": int(len(df)),
-                    "columns": int(len(df.columns)),
-                    "column_types": column_types,
-                    "missing_values": convert_to_serializable(df.isnull().sum().to_dict()),
-                    "non_null_counts": convert_to_serializable(non_null_counts),
-                }
-                return {
-                    "analysis": analysis_text,
-                    "data_summary": convert_to_serializable(data_summary),
-                }
+                return {"analysis": analysis_text}
 
             # Analyser les données pour extraire des insights
             insights = []
@@ -279,14 +484,14 @@ class SimpleAnalysisService:
             
             # Analyser les sources de trafic
             if 'source_trafic' in df.columns:
-                source_performance = df.groupby('source_trafic')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                source_performance = self._conversion_rate_by(df, 'source_trafic')
                 best_source = source_performance.idxmax()
                 best_rate = source_performance.max()
                 insights.append(f"Meilleure source de trafic: {best_source} ({best_rate:.1f}% de conversion)")
             
             # Analyser les appareils
             if 'appareil' in df.columns:
-                device_performance = df.groupby('appareil')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                device_performance = self._conversion_rate_by(df, 'appareil')
                 best_device = device_performance.idxmax()
                 best_device_rate = device_performance.max()
                 insights.append(f"Appareil le plus performant: {best_device} ({best_device_rate:.1f}% de conversion)")
@@ -303,72 +508,111 @@ class SimpleAnalysisService:
                 avg_engagement = df['score_engagement'].mean()
                 insights.append(f"Score d'engagement moyen: {avg_engagement:.2f}/1.0")
             
-            # Préparer les données pour l'IA
-            data_summary = {
-                "rows": int(len(df)),
-                "columns": int(len(df.columns)),
-                "column_types": {col: str(dtype) for col, dtype in df.dtypes.items()},
-                "missing_values": convert_to_serializable(df.isnull().sum().to_dict()),
-                "sample_data": convert_to_serializable(df.head(5).to_dict('list')),
-                "insights": insights
-            }
-            
-            # Prompt amélioré
-            prompt = f"""
-            Tu es un expert en analyse marketing web. Analyse ce dataset et réponds à cette question: {question}
-            
-            Informations sur le dataset:
-            - Nombre de lignes: {len(df)}
-            - Nombre de colonnes: {len(df.columns)}
-            - Colonnes disponibles: {list(df.columns)}
-            
-            Insights extraits:
-            {chr(10).join(insights)}
-            
-            Instructions:
-            1. Fournis une analyse détaillée et professionnelle
-            2. Identifie les tendances clés et les opportunités
-            3. Propose des recommandations actionnables
-            4. Utilise des métriques concrètes
-            5. Structure ta réponse avec des sections claires
-            
-            Réponds en français de manière professionnelle.
-            """
-            
-            response = self.openai_client.chat.completions.create(
-                model=self.settings["model"],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=self.settings["max_tokens"],
-                temperature=self.settings["temperature"]
+            # Prompt: seules les données et la question varient, les instructions sont dans le message système
+            prompt = ANALYSIS_USER_PROMPT_TEMPLATE.format(
+                rows=len(df),
+                column_count=len(df.columns),
+                columns=self._format_columns_for_prompt(df.columns),
+                insights="\n".join(insights),
+                question=question
             )
             
+            analysis, cache_hit = self._cached_openai_call(prompt)
             return {
-                "analysis": response.choices[0].message.content,
-                "data_summary": convert_to_serializable(data_summary)
+                "analysis": analysis,
+                "cache_hit": cache_hit
             }
             
         except Exception as e:
             logger.error(f"Erreur analyse IA: {str(e)}")
             return {
                 "analysis": f"Erreur lors de l'analyse IA: {str(e)}",
-                "data_summary": {}
+                "error": True
             }
-    
 
-    
-    def _simple_anonymize(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Anonymisation simple des données"""
-        df_anon = df.copy()
+    @staticmethod
+    def _format_columns_for_prompt(columns: pd.Index) -> str:
+        """Liste des colonnes tronquée à `PROMPT_COLUMNS_MAX_CHARS` pour borner la taille du prompt"""
+        names = []
+        length = 0
+        for col in columns:
+            name = str(col)
+            length += len(name) + 2
+            if length > PROMPT_COLUMNS_MAX_CHARS:
+                marker = f"... (+{len(columns) - len(names)} colonnes)"
+                return ", ".join(names + [marker])
+            names.append(name)
+        return ", ".join(names)
+
+    def _cached_openai_call(self, prompt: str) -> Tuple[str, bool]:
+        """Appel OpenAI mémorisé par (modèle, paramètres, prompt)"""
+        key = hash_request(
+            self.settings["model"],
+            self.settings["max_tokens"],
+            self.settings["temperature"],
+            prompt
+        )
+        cached = self._prompt_cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        analysis = self._call_openai(prompt)
+        self._prompt_cache.set(key, analysis)
+        return analysis, False
+
+    def _call_openai(self, prompt: str) -> str:
+        """Appel OpenAI borné: quotas RPM/TPM et au plus `openai_max_concurrency` appels simultanés"""
+        # Estimation simple: ~4 caractères par token, plus la réponse maximale
+        self._rate_limiter.acquire(
+            (len(ANALYSIS_SYSTEM_PROMPT) + len(prompt)) // 4 + self.settings["max_tokens"]
+        )
+        with self._openai_slots:
+            response = self.openai_client.chat.completions.create(
+                model=self.settings["model"],
+                messages=[_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+                max_tokens=self.settings["max_tokens"],
+                temperature=self.settings["temperature"]
+            )
+        return response.choices[0].message.content
+
+    def _identify_sensitive_columns(self, df: pd.DataFrame) -> List[Any]:
+        """Liste les colonnes sensibles en une seule passe sur les noms de colonnes"""
+        return [col for col in df.columns if _is_sensitive_name(col)]
+
+    def _simple_anonymize(
+        self,
+        df: pd.DataFrame,
+        sensitive_columns: Optional[List[Any]] = None
+    ) -> pd.DataFrame:
+        """Anonymisation simple des données
+
+        Copie superficielle: seules les colonnes sensibles sont remplacées, les autres
+        partagent les buffers du DataFrame d'origine (qui n'est pas modifié).
+        """
+        if sensitive_columns is None:
+            sensitive_columns = self._identify_sensitive_columns(df)
+        df_anon = df.copy(deep=False)
         
-        # Anonymiser les colonnes sensibles
-        sensitive_patterns = ['email', 'phone', 'address', 'name', 'id', 'user']
-        for col in df_anon.columns:
-            if any(pattern in col.lower() for pattern in sensitive_patterns):
-                if df_anon[col].dtype == 'object':
-                    df_anon[col] = f"ANONYMIZED_{col.upper()}"
+        # Anonymiser les colonnes sensibles (diffusion d'un scalaire, la colonne reste de type texte)
+        for col in sensitive_columns:
+            if df_anon[col].dtype == 'object':
+                df_anon[col] = f"ANONYMIZED_{str(col).upper()}"
         
         return df_anon
 
+    @staticmethod
+    def _find_date_column(df: pd.DataFrame) -> Optional[Any]:
+        """Première colonne dont le nom évoque une date, en une seule passe vectorisée"""
+        matches = np.flatnonzero(
+            df.columns.astype(str).str.contains(_DATE_COLUMN_PATTERN, case=False, regex=True)
+        )
+        return df.columns[matches[0]] if len(matches) else None
+
+    @staticmethod
+    def _conversion_rate_by(df: pd.DataFrame, column: str) -> pd.Series:
+        """Taux de conversion (%) par valeur de `column`, agrégé en une passe vectorisée"""
+        return (df['conversion'] == 'Oui').groupby(df[column]).mean() * 100
+
     def _generate_business_insights(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Génération d'insights métier intelligents"""
         insights = []
@@ -386,7 +630,7 @@ class SimpleAnalysisService:
             
             # Insight 2: Source de trafic la plus performante
             if 'source_trafic' in df.columns and 'conversion' in df.columns:
-                source_performance = df.groupby('source_trafic')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                source_performance = self._conversion_rate_by(df, 'source_trafic')
                 best_source = source_performance.idxmax()
                 best_rate = source_performance.max()
                 insights.append({
@@ -398,7 +642,7 @@ class SimpleAnalysisService:
             
             # Insight 3: Performance mobile vs desktop
             if 'appareil' in df.columns and 'conversion' in df.columns:
-                device_performance = df.groupby('appareil')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                device_performance = self._conversion_rate_by(df, 'appareil')
                 if len(device_performance) > 1:
                     best_device = device_performance.idxmax()
                     best_device_rate = device_performance.max()
@@ -431,13 +675,11 @@ class SimpleAnalysisService:
                 })
             
             # Insight 6: Analyse temporelle (si date disponible)
-            date_columns = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]
-            if date_columns:
-                date_col = date_columns[0]
+            date_col = self._find_date_column(df)
+            if date_col is not None:
                 try:
-                    df[date_col] = pd.to_datetime(df[date_col])
-                    df_sorted = df.sort_values(date_col)
-                    total_days = (df_sorted[date_col].max() - df_sorted[date_col].min()).days
+                    dates = pd.to_datetime(df[date_col])
+                    total_days = (dates.max() - dates.min()).days
                     insights.append({
                         "title": "Période d'analyse",
                         "description": f"Données collectées sur {total_days} jours, permettant une analyse temporelle fiable.",
@@ -499,7 +741,7 @@ class SimpleAnalysisService:
                     })
             
             if 'source_trafic' in df.columns and 'conversion' in df.columns:
-                source_performance = df.groupby('source_trafic')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                source_performance = self._conversion_rate_by(df, 'source_trafic')
                 worst_source = source_performance.idxmin()
                 worst_rate = source_performance.min()
                 if worst_rate < 1.0:
@@ -513,7 +755,7 @@ class SimpleAnalysisService:
                     })
             
             if 'appareil' in df.columns and 'conversion' in df.columns:
-                device_performance = df.groupby('appareil')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                device_performance = self._conversion_rate_by(df, 'appareil')
                 if len(device_performance) > 1:
                     worst_device = device_performance.idxmin()
                     worst_device_rate = device_performance.min()
@@ -580,7 +822,8 @@ class SimpleAnalysisService:
         
         try:
             # Anomalie 1: Valeurs manquantes
-            missing_values = df.isnull().sum().sum()
+            missing_counts = df.isnull().sum()
+            missing_values = missing_counts.sum()
             if missing_values > 0:
                 missing_percentage = (missing_values / (len(df) * len(df.columns))) * 100
                 if missing_percentage > 10:
@@ -588,28 +831,30 @@ class SimpleAnalysisService:
                         "type": "missing_values",
                         "description": f"Valeurs manquantes élevées: {missing_percentage:.1f}% des données",
                         "severity": "high",
-                        "affected_columns": df.columns[df.isnull().sum() > 0].tolist()
+                        "affected_columns": df.columns[missing_counts > 0].tolist()
                     })
                 else:
                     anomalies.append({
                         "type": "missing_values",
                         "description": f"Valeurs manquantes détectées: {missing_values} au total",
                         "severity": "medium",
-                        "affected_columns": df.columns[df.isnull().sum() > 0].tolist()
+                        "affected_columns": df.columns[missing_counts > 0].tolist()
                     })
             
             # Anomalie 2: Valeurs extrêmes dans les colonnes numériques
-            numeric_columns = df.select_dtypes(include=[np.number]).columns
-            for col in numeric_columns:
-                if len(df[col].dropna()) > 0:
-                    Q1 = df[col].quantile(0.25)
-                    Q3 = df[col].quantile(0.75)
-                    IQR = Q3 - Q1
-                    outliers = df[(df[col] < Q1 - 1.5 * IQR) | (df[col] > Q3 + 1.5 * IQR)]
-                    if len(outliers) > 0:
+            # (quartiles de toutes les colonnes en un seul appel numpy)
+            numeric = df.select_dtypes(include=[np.number])
+            numeric = numeric.loc[:, numeric.notna().any()]
+            if numeric.shape[1] > 0:
+                values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+                Q1, Q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                IQR = Q3 - Q1
+                outlier_counts = ((values < Q1 - 1.5 * IQR) | (values > Q3 + 1.5 * IQR)).sum(axis=0)
+                for col, count in zip(numeric.columns, outlier_counts):
+                    if count > 0:
                         anomalies.append({
                             "type": "outliers",
-                            "description": f"Valeurs extrêmes détectées dans {col}: {len(outliers)} valeurs",
+                            "description": f"Valeurs extrêmes détectées dans {col}: {count} valeurs",
                             "severity": "medium",
                             "affected_columns": [col]
                         })
@@ -654,6 +899,29 @@ class SimpleAnalysisService:
             logger.error(f"Erreur génération résumé: {str(e)}")
             return f"Analyse de {len(df)} lignes et {len(df.columns)} colonnes"
 
+    @staticmethod
+    def _build_chart(*, title: str, chart_type: str, labels: List[Any], values: List[Any]) -> Dict[str, Any]:
+        """Construit la description JSON d'un graphique"""
+        return {
+            "title": title,
+            "type": chart_type,
+            "data": {
+                "labels": labels,
+                "values": values
+            },
+            "format": "json"
+        }
+
+    def _dtype_distribution_chart(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Graphique de repli: distribution des types de colonnes"""
+        dtype_counts = df.dtypes.value_counts()
+        return self._build_chart(
+            title="Distribution des types de données",
+            chart_type="bar",
+            labels=dtype_counts.index.astype(str).tolist(),
+            values=dtype_counts.values.astype(int).tolist()
+        )
+
     def _generate_dynamic_charts(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Génération de graphiques dynamiques selon le contenu"""
         charts = []
@@ -661,110 +929,77 @@ class SimpleAnalysisService:
         try:
             # Graphique 1: Taux de conversion par source de trafic
             if 'source_trafic' in df.columns and 'conversion' in df.columns:
-                conversion_by_source = df.groupby('source_trafic')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                conversion_by_source = self._conversion_rate_by(df, 'source_trafic')
                 if len(conversion_by_source) > 1:
-                    charts.append({
-                        "title": "Taux de conversion par source de trafic",
-                        "type": "bar",
-                        "data": {
-                            "labels": list(conversion_by_source.index),
-                            "values": list(conversion_by_source.values)
-                        },
-                        "format": "json"
-                    })
+                    charts.append(self._build_chart(
+                        title="Taux de conversion par source de trafic",
+                        chart_type="bar",
+                        labels=conversion_by_source.index.tolist(),
+                        values=conversion_by_source.tolist()
+                    ))
             
             # Graphique 2: Performance par appareil
             if 'appareil' in df.columns and 'conversion' in df.columns:
-                conversion_by_device = df.groupby('appareil')['conversion'].apply(lambda x: (x == 'Oui').mean() * 100)
+                conversion_by_device = self._conversion_rate_by(df, 'appareil')
                 if len(conversion_by_device) > 1:
-                    charts.append({
-                        "title": "Taux de conversion par appareil",
-                        "type": "bar",
-                        "data": {
-                            "labels": list(conversion_by_device.index),
-                            "values": list(conversion_by_device.values)
-                        },
-                        "format": "json"
-                    })
+                    charts.append(self._build_chart(
+                        title="Taux de conversion par appareil",
+                        chart_type="bar",
+                        labels=conversion_by_device.index.tolist(),
+                        values=conversion_by_device.tolist()
+                    ))
             
             # Graphique 3: Répartition des montants d'achat
             if 'montant_achat' in df.columns:
                 purchase_amounts = df[df['montant_achat'] > 0]['montant_achat']
                 if len(purchase_amounts) > 0:
-                    # Créer des bins pour les montants
-                    bins = [0, 50, 100, 200, 500, 1000, float('inf')]
-                    labels = ['0-50€', '50-100€', '100-200€', '200-500€', '500-1000€', '1000€+']
-                    purchase_bins = pd.cut(purchase_amounts, bins=bins, labels=labels, include_lowest=True)
-                    purchase_distribution = purchase_bins.value_counts()
+                    # Comptage par tranche en une passe: intervalles fermés à droite, comme pd.cut
+                    bin_index = np.searchsorted(PURCHASE_AMOUNT_EDGES, purchase_amounts.to_numpy(), side='left')
+                    counts = np.bincount(bin_index, minlength=len(PURCHASE_AMOUNT_LABELS))
                     
-                    charts.append({
-                        "title": "Répartition des montants d'achat",
-                        "type": "pie",
-                        "data": {
-                            "labels": list(purchase_distribution.index),
-                            "values": list(purchase_distribution.values)
-                        },
-                        "format": "json"
-                    })
+                    charts.append(self._build_chart(
+                        title="Répartition des montants d'achat",
+                        chart_type="pie",
+                        labels=list(PURCHASE_AMOUNT_LABELS),
+                        values=counts.tolist()
+                    ))
             
             # Graphique 4: Score d'engagement par localisation
             if 'localisation' in df.columns and 'score_engagement' in df.columns:
                 engagement_by_location = df.groupby('localisation')['score_engagement'].mean()
                 if len(engagement_by_location) > 1:
-                    charts.append({
-                        "title": "Score d'engagement moyen par ville",
-                        "type": "bar",
-                        "data": {
-                            "labels": list(engagement_by_location.index),
-                            "values": list(engagement_by_location.values)
-                        },
-                        "format": "json"
-                    })
+                    charts.append(self._build_chart(
+                        title="Score d'engagement moyen par ville",
+                        chart_type="bar",
+                        labels=engagement_by_location.index.tolist(),
+                        values=engagement_by_location.tolist()
+                    ))
             
             # Graphique 5: Distribution temporelle (si date disponible)
-            date_columns = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]
-            if date_columns:
-                date_col = date_columns[0]
+            date_col = self._find_date_column(df)
+            if date_col is not None:
                 try:
-                    df[date_col] = pd.to_datetime(df[date_col])
-                    daily_activity = df.groupby(df[date_col].dt.date).size()
+                    # Regroupement sur le jour en datetime64 (pas d'objets date Python)
+                    dates = pd.to_datetime(df[date_col]).dt.normalize()
+                    daily_activity = dates.value_counts(sort=False).sort_index()
                     if len(daily_activity) > 1:
-                        charts.append({
-                            "title": "Activité quotidienne",
-                            "type": "line",
-                            "data": {
-                                "labels": [str(date) for date in daily_activity.index],
-                                "values": list(daily_activity.values)
-                            },
-                            "format": "json"
-                        })
+                        charts.append(self._build_chart(
+                            title="Activité quotidienne",
+                            chart_type="line",
+                            labels=daily_activity.index.strftime('%Y-%m-%d').tolist(),
+                            values=daily_activity.tolist()
+                        ))
                 except:
                     pass
             
             # Graphique 6: Distribution des types de données (fallback)
             if not charts:
-                charts.append({
-                    "title": "Distribution des types de données",
-                    "type": "bar",
-                    "data": {
-                        "labels": list(df.dtypes.value_counts().index.astype(str)),
-                        "values": list(df.dtypes.value_counts().values.astype(int))
-                    },
-                    "format": "json"
-                })
+                charts.append(self._dtype_distribution_chart(df))
             
         except Exception as e:
             logger.error(f"Erreur génération graphiques: {str(e)}")
             # Fallback
-            charts.append({
-                "title": "Distribution des types de données",
-                "type": "bar",
-                "data": {
-                    "labels": list(df.dtypes.value_counts().index.astype(str)),
-                    "values": list(df.dtypes.value_counts().values.astype(int))
-                },
-                "format": "json"
-            })
+            charts.append(self._dtype_distribution_chart(df))
         
         return charts
     
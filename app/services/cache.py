@@ -0,0 +1,83 @@
+"""
+Cache mémoire simple pour les analyses IA
+LRU borné avec expiration (TTL), sans dépendance externe
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import pandas as pd
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """Empreinte rapide du contenu d'un DataFrame (noms de colonnes + valeurs)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for col in df.columns:
+        digest.update(str(col).encode("utf-8"))
+        # Séparateur: ('ab', 'c') et ('a', 'bc') ne doivent pas donner la même empreinte
+        digest.update(b"\x1f")
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Forme canonique d'une question: casse, espaces et ponctuation finale ignorés"""
+    return _WHITESPACE_RE.sub(" ", question).strip(" ?!.").casefold()
+
+
+def hash_request(*parts: Any) -> str:
+    """Empreinte d'une requête (modèle, paramètres, prompt...) pour le cache des réponses"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class TTLCache:
+    """Cache LRU avec durée de vie, protégé par un verrou.
+
+    Le verrou n'est jamais tenu pendant un `await`: le cache peut donc être partagé
+    entre la boucle asyncio et les threads de FastAPI.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne la valeur associée à `key`, ou None si absente ou expirée"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insère une valeur et évince l'entrée la plus ancienne si nécessaire"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
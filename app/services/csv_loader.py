@@ -0,0 +1,38 @@
+"""
+Lecture des fichiers CSV téléversés
+Encodage et séparateur déterminés une seule fois, puis un unique passage du parseur
+"""
+
+import io
+
+import pandas as pd
+
+# Encodages essayés dans l'ordre: cp1252 (€, œ, guillemets typographiques) avant latin-1,
+# qui accepte tous les octets et sert donc de repli final
+CSV_ENCODINGS = ('utf-8', 'cp1252', 'latin-1')
+# Séparateurs reconnus, par ordre de préférence en cas d'égalité
+CSV_SEPARATORS = (',', ';', '\t')
+
+
+def decode_csv_bytes(content: bytes) -> str:
+    """Décode le contenu avec le premier encodage valide"""
+    for encoding in CSV_ENCODINGS:
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("Encodage du fichier non reconnu")
+
+
+def detect_separator(text: str) -> str:
+    """Séparateur le plus fréquent sur la ligne d'en-tête"""
+    end = text.find('\n')
+    header = text if end == -1 else text[:end]
+    return max(CSV_SEPARATORS, key=header.count)
+
+
+def read_csv_bytes(content: bytes) -> pd.DataFrame:
+    """Parse un CSV en un seul appel à `pd.read_csv`"""
+    text = decode_csv_bytes(content)
+    separator = detect_separator(text)
+    return pd.read_csv(io.StringIO(text), sep=separator)
@@ -0,0 +1,66 @@
+"""
+Limiteur de débit côté client pour l'API OpenAI
+Double seau à jetons: requêtes par minute (RPM) et tokens par minute (TPM)
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """Attend la capacité nécessaire avant chaque appel plutôt que d'essuyer des erreurs 429.
+
+    Les deux seaux se remplissent en continu au prorata du temps écoulé. `acquire` bloque
+    le thread appelant (les analyses tournent dans des threads de travail, jamais sur la
+    boucle d'événements).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if requests_per_minute <= 0 or tokens_per_minute <= 0:
+            raise ValueError("Les limites RPM et TPM doivent être strictement positives")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._requests_available = float(requests_per_minute)
+        self._tokens_available = float(tokens_per_minute)
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests_available = min(
+            self.requests_per_minute,
+            self._requests_available + elapsed * self.requests_per_minute / 60
+        )
+        self._tokens_available = min(
+            self.tokens_per_minute,
+            self._tokens_available + elapsed * self.tokens_per_minute / 60
+        )
+
+    def acquire(self, tokens: int) -> None:
+        """Réserve une requête et `tokens` tokens, en attendant si nécessaire"""
+        # Une requête plus grosse que le seau entier ne passerait jamais
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests_available >= 1 and self._tokens_available >= tokens:
+                    self._requests_available -= 1
+                    self._tokens_available -= tokens
+                    return
+                wait = max(
+                    (1 - self._requests_available) * 60 / self.requests_per_minute,
+                    (tokens - self._tokens_available) * 60 / self.tokens_per_minute,
+                    0.0
+                )
+            self._sleep(wait)
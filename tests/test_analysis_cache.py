@@ -0,0 +1,89 @@
+import pandas as pd
+from app.services.analysis_service import SimpleAnalysisService
+from app.services.cache import TTLCache, hash_dataframe
+
+
+def test_hash_dataframe_depends_on_content_and_columns():
+    df = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+    assert hash_dataframe(df) == hash_dataframe(df.copy())
+    assert hash_dataframe(df) != hash_dataframe(df.rename(columns={'a': 'c'}))
+    assert hash_dataframe(df) != hash_dataframe(pd.DataFrame({'a': [1, 3], 'b': ['x', 'y']}))
+
+
+def test_hash_dataframe_separates_column_names():
+    values = {'x': ['mobile', 'desktop'], 'y': ['Oui', 'Non']}
+    df_a = pd.DataFrame({'appareil': values['x'], 'conversion': values['y']})
+    df_b = pd.DataFrame({'appareilc': values['x'], 'onversion': values['y']})
+    assert hash_dataframe(df_a) != hash_dataframe(df_b)
+
+
+def test_column_names_are_part_of_the_cache_key():
+    values = {'x': ['mobile', 'desktop', 'mobile'], 'y': ['Oui', 'Non', 'Non']}
+    service = SimpleAnalysisService()
+
+    service.analyze_single_file(
+        df=pd.DataFrame({'appareil': values['x'], 'conversion': values['y']}),
+        question='Analyse', anonymize_data=False
+    )
+    result = service.analyze_single_file(
+        df=pd.DataFrame({'appareilc': values['x'], 'onversion': values['y']}),
+        question='Analyse', anonymize_data=False
+    )
+
+    assert result['performance_metrics']['ai_cache_hit'] is False
+    assert "Taux de conversion par appareil" not in [c['title'] for c in result['charts']]
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=-1)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+
+
+def test_repeated_analysis_is_served_from_cache():
+    df = pd.DataFrame({'score': [0.1, 0.5, 0.9], 'city': ['Paris', 'Lyon', 'Nice']})
+    service = SimpleAnalysisService()
+
+    first = service.analyze_single_file(df=df, question='Analyse', anonymize_data=False)
+    second = service.analyze_single_file(df=df, question='Analyse', anonymize_data=False)
+
+    assert first['performance_metrics']['ai_cache_hit'] is False
+    assert second['performance_metrics']['ai_cache_hit'] is True
+    assert second['performance_metrics']['openai_tokens_used'] == 0
+    assert second['ai_analysis'] == first['ai_analysis']
+
+    other = service.analyze_single_file(df=df, question='Autre question', anonymize_data=False)
+    assert other['performance_metrics']['ai_cache_hit'] is False
+
+
+def test_question_variants_share_cache_entry():
+    df = pd.DataFrame({'score': [0.1, 0.5, 0.9]})
+    service = SimpleAnalysisService()
+
+    service.analyze_single_file(df=df, question='Quelle est la tendance ?', anonymize_data=False)
+    result = service.analyze_single_file(df=df, question='  quelle est   la tendance', anonymize_data=False)
+
+    assert result['performance_metrics']['ai_cache_hit'] is True
+
+
+def test_charts_are_served_from_cache():
+    df = pd.DataFrame({'appareil': ['mobile', 'desktop', 'mobile'], 'conversion': ['Oui', 'Non', 'Non']})
+    service = SimpleAnalysisService()
+
+    first = service.analyze_single_file(df=df, question='Analyse', anonymize_data=False)
+    assert len(service._chart_cache) == 1
+
+    second = service.analyze_single_file(df=df, question='Autre question', anonymize_data=False)
+    assert second['charts'] == first['charts']
+    assert len(service._chart_cache) == 1
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from app.services.analysis_service import SimpleAnalysisService
+
+
+def test_outliers_are_counted_per_numeric_column():
+    df = pd.DataFrame({
+        'montant': [10, 12, 11, 13, 500, np.nan],
+        'score': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+        'vide': [np.nan] * 6,
+        'ville': ['a', 'b', 'c', 'd', 'e', 'f']
+    })
+    anomalies = SimpleAnalysisService()._detect_anomalies(df)
+    outliers = [a for a in anomalies if a['type'] == 'outliers']
+
+    assert [a['affected_columns'] for a in outliers] == [['montant']]
+    assert outliers[0]['description'] == "Valeurs extrêmes détectées dans montant: 1 valeurs"
+
+
+def test_missing_values_report_affected_columns():
+    df = pd.DataFrame({'a': [1, None, 3, 4], 'b': ['x', 'y', 'z', 't'], 'c': [None, None, 1.0, 2.0]})
+    anomalies = SimpleAnalysisService()._detect_anomalies(df)
+    missing = next(a for a in anomalies if a['type'] == 'missing_values')
+
+    assert missing['severity'] == 'high'
+    assert missing['affected_columns'] == ['a', 'c']
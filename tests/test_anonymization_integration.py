@@ -1,5 +1,5 @@
 import os
-from datetime import datetime
+from time import gmtime, strftime
 import hashlib
 import pandas as pd
 import pytest
@@ -34,22 +34,25 @@ def test_integration_openai_anonymization_no_leak(tmp_path):
     logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
     os.makedirs(logs_dir, exist_ok=True)
     out = os.path.join(logs_dir, 'anonymization_integration_test.log')
-    sha = hashlib.sha256(ai_text.encode('utf-8')).hexdigest()[:12]
+    digest = hashlib.blake2b(ai_text.encode('utf-8'), digest_size=6).hexdigest()
     sensitive_cols = privacy.get('sensitive_columns_detected', [])
     model_used = service.settings.get('model')
-    with open(out, 'a', encoding='utf-8') as f:
-        f.write(
-            (
-                "\n=== Anonymization Integration Test ===\n"
-                f"timestamp: {datetime.utcnow().isoformat()}Z\n"
-                f"model: {model_used}\n"
-                f"anonymization_applied: {privacy.get('anonymization_applied')}\n"
-                f"sensitive_columns_detected_count: {len(sensitive_cols)}\n"
-                f"sensitive_columns_detected: {', '.join(sensitive_cols) if sensitive_cols else '-'}\n"
-                f"ai_analysis_length: {len(ai_text)}\n"
-                f"ai_analysis_sha256_12: {sha}\n"
-                "result: PASS\n"
-            )
-        )
+    entry = (
+        "\n=== Anonymization Integration Test ===\n"
+        f"timestamp: {strftime('%Y-%m-%dT%H:%M:%SZ', gmtime())}\n"
+        f"model: {model_used}\n"
+        f"anonymization_applied: {privacy.get('anonymization_applied')}\n"
+        f"sensitive_columns_detected_count: {len(sensitive_cols)}\n"
+        f"sensitive_columns_detected: {', '.join(sensitive_cols) if sensitive_cols else '-'}\n"
+        f"ai_analysis_length: {len(ai_text)}\n"
+        f"ai_analysis_blake2b_12: {digest}\n"
+        "result: PASS\n"
+    )
+    # Un seul appel système en mode ajout, sans couche d'E/S bufferisée
+    fd = os.open(out, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, entry.encode('utf-8'))
+    finally:
+        os.close(fd)
 
 
@@ -0,0 +1,34 @@
+import pandas as pd
+from app.services.analysis_service import SimpleAnalysisService
+
+
+def test_date_column_detection_handles_non_string_names():
+    df = pd.DataFrame({0: [1, 2], 'Event_Time': ['2024-01-01', '2024-01-02'], 'date': ['x', 'y']})
+    assert SimpleAnalysisService._find_date_column(df) == 'Event_Time'
+    assert SimpleAnalysisService._find_date_column(pd.DataFrame({0: [1], 1: [2]})) is None
+
+
+def test_purchase_amount_buckets_are_right_closed():
+    df = pd.DataFrame({'montant_achat': [0, 10, 50, 50.5, 120, 1000, 2500]})
+    charts = SimpleAnalysisService()._generate_dynamic_charts(df)
+    chart = next(c for c in charts if c['title'] == "Répartition des montants d'achat")
+    assert chart['data']['labels'] == ['0-50€', '50-100€', '100-200€', '200-500€', '500-1000€', '1000€+']
+    assert chart['data']['values'] == [2, 1, 1, 0, 1, 1]
+
+
+def test_daily_activity_chart_does_not_modify_input():
+    df = pd.DataFrame({'date_visite': ['2024-01-02 10:00', '2024-01-01 09:00', '2024-01-02 18:30']})
+    charts = SimpleAnalysisService()._generate_dynamic_charts(df)
+    chart = next(c for c in charts if c['title'] == "Activité quotidienne")
+    assert chart['data']['labels'] == ['2024-01-01', '2024-01-02']
+    assert chart['data']['values'] == [1, 2]
+    assert df['date_visite'].dtype == object
+
+
+def test_conversion_rate_by_segment():
+    df = pd.DataFrame({
+        'appareil': ['mobile', 'mobile', 'desktop', 'desktop', None],
+        'conversion': ['Oui', 'Non', 'Oui', 'Oui', 'Oui']
+    })
+    rates = SimpleAnalysisService._conversion_rate_by(df, 'appareil')
+    assert rates.to_dict() == {'desktop': 100.0, 'mobile': 50.0}
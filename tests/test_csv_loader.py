@@ -0,0 +1,29 @@
+import pytest
+from app.services.csv_loader import detect_separator, read_csv_bytes
+
+
+@pytest.mark.parametrize('separator', [',', ';', '\t'])
+def test_separator_is_detected_from_header(separator):
+    content = separator.join(['ville', 'prix', 'quantite']) + '\nParis' + separator + '10' + separator + '2\n'
+    df = read_csv_bytes(content.encode('utf-8'))
+    assert df.columns.tolist() == ['ville', 'prix', 'quantite']
+    assert df['prix'].tolist() == [10]
+
+
+def test_semicolon_wins_over_commas_inside_header():
+    assert detect_separator('nom;prix,ttc;quantite\na;1,5;2') == ';'
+
+
+def test_latin1_content_is_decoded():
+    df = read_csv_bytes('ville,montant\nBéziers,12\n'.encode('latin-1'))
+    assert df['ville'].tolist() == ['Béziers']
+
+
+def test_cp1252_content_keeps_euro_and_ligatures():
+    df = read_csv_bytes('produit,prix\nœuvre,12 €\n'.encode('cp1252'))
+    assert df.iloc[0].tolist() == ['œuvre', '12 €']
+
+
+def test_bytes_undefined_in_cp1252_fall_back_to_latin1():
+    df = read_csv_bytes(b'code,valeur\n\x81,1\n')
+    assert df['code'].tolist() == ['\x81']
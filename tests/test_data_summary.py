@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from app.services.analysis_service import SimpleAnalysisService, convert_to_serializable
+
+
+def test_data_summary_reports_types_and_missing_values():
+    df = pd.DataFrame({'age': [20, 30, np.nan], 'ville': ['Paris', None, 'Lyon']})
+    summary = SimpleAnalysisService._build_data_summary(df)
+
+    assert summary['shape'] == {'rows': 3, 'columns': 2}
+    assert summary['data_types'] == {'age': 'float64', 'ville': 'object'}
+    assert summary['columns']['ville'] == {'name': 'ville', 'dtype': 'object'}
+    assert summary['missing_values'] == {'age': 1, 'ville': 1}
+    assert summary['basic_stats']['total_missing_values'] == 2
+    assert abs(summary['basic_stats']['missing_percentage'] - 100 / 3) < 1e-9
+
+
+def test_convert_to_serializable_handles_numpy_and_missing_values():
+    converted = convert_to_serializable({
+        'count': np.int64(3),
+        'ratio': np.float32(0.5),
+        'values': [np.nan, 'a', True, None, np.array([1, 2])],
+        'series': pd.Series([1, 2]),
+        'ts': pd.NaT
+    })
+    assert converted == {'count': 3, 'ratio': 0.5, 'values': [None, 'a', True, None, [1, 2]], 'series': [1, 2], 'ts': None}
+    assert type(converted['count']) is int
@@ -0,0 +1,32 @@
+import logging
+from logging.handlers import QueueHandler
+
+from app.logging_config import setup_logging, shutdown_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_records_are_written_through_the_queue_listener():
+    root = logging.getLogger()
+    previous_handlers = root.handlers[:]
+    target = ListHandler()
+    root.handlers = [target]
+    try:
+        setup_logging(logging.INFO)
+        assert isinstance(root.handlers[0], QueueHandler)
+
+        logging.getLogger('zukii.test').info('message via queue')
+        shutdown_logging()
+
+        assert target.messages == ['message via queue']
+        assert root.handlers == [target]
+    finally:
+        shutdown_logging()
+        root.handlers = previous_handlers
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+import pandas as pd
+from app.services.analysis_service import SimpleAnalysisService
+
+
+def test_multiple_files_keep_order_and_metadata():
+    files_data = [
+        ('a.csv', pd.DataFrame({'a': [1, 2]})),
+        ('b.csv', pd.DataFrame({'b': [1, 2, 3], 'c': ['x', 'y', 'z']})),
+        ('c.csv', pd.DataFrame({'d': [0.5]})),
+    ]
+
+    service = SimpleAnalysisService()
+    result = asyncio.run(service.analyze_multiple_files(files_data=files_data, question='Analyse'))
+
+    assert result['total_files'] == 3
+    assert result['files_analyzed'] == [
+        {'filename': 'a.csv', 'rows': 2, 'columns': 1},
+        {'filename': 'b.csv', 'rows': 3, 'columns': 2},
+        {'filename': 'c.csv', 'rows': 1, 'columns': 1},
+    ]
+    assert [r['file_info']['filename'] for r in result['individual_results']] == ['a.csv', 'b.csv', 'c.csv']
+
+
+def test_async_analysis_runs_on_dedicated_executor():
+    service = SimpleAnalysisService()
+    seen = []
+    original = service.analyze_single_file
+
+    def recording(*args, **kwargs):
+        seen.append(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    service.analyze_single_file = recording
+    asyncio.run(service.analyze_single_file_async(df=pd.DataFrame({'a': [1, 2]}), question='Analyse'))
+
+    assert seen and seen[0].startswith('analysis')
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pandas as pd
+from app.services.analysis_service import PROMPT_COLUMNS_MAX_CHARS, SimpleAnalysisService
+
+
+class FakeCompletions:
+    def __init__(self, content='Analyse détaillée du dataset.'):
+        self.content = content
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_service(completions):
+    service = SimpleAnalysisService()
+    service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+
+def test_online_analysis_uses_injected_client():
+    completions = FakeCompletions()
+    service = make_service(completions)
+    df = pd.DataFrame({'score': [0.1, 0.5], 'city': ['Paris', 'Lyon']})
+
+    result = service.analyze_single_file(df=df, question='Quelle ville ?', anonymize_data=False)
+
+    assert result['ai_analysis'] == 'Analyse détaillée du dataset.'
+    assert len(completions.calls) == 1
+    assert completions.calls[0]['model'] == service.settings['model']
+    assert 'Quelle ville ?' in completions.calls[0]['messages'][-1]['content']
+
+
+def test_identical_prompt_is_served_from_prompt_cache():
+    completions = FakeCompletions()
+    service = make_service(completions)
+    # Même schéma et mêmes agrégats, valeurs différentes: le prompt envoyé est identique
+    first = pd.DataFrame({'score': [0.1, 0.5], 'city': ['Paris', 'Lyon']})
+    second = pd.DataFrame({'score': [0.2, 0.7], 'city': ['Nice', 'Lille']})
+
+    service.analyze_single_file(df=first, question='Analyse', anonymize_data=False)
+    result = service.analyze_single_file(df=second, question='Analyse', anonymize_data=False)
+
+    assert len(completions.calls) == 1
+    assert result['performance_metrics']['ai_cache_hit'] is True
+    assert result['performance_metrics']['openai_tokens_used'] == 0
+
+
+def test_static_instructions_are_sent_first():
+    completions = FakeCompletions()
+    service = make_service(completions)
+    df = pd.DataFrame({'score': [0.1, 0.5]})
+
+    service.analyze_single_file(df=df, question='Première question', anonymize_data=False)
+    service.analyze_single_file(df=df, question='Seconde question', anonymize_data=False)
+
+    first, second = (call['messages'] for call in completions.calls)
+    assert first[0]['role'] == 'system'
+    assert first[0] == second[0]
+    assert first[-1]['content'].endswith('Question: Première question')
+
+
+def test_wide_dataset_column_list_is_truncated_in_prompt():
+    completions = FakeCompletions()
+    service = make_service(completions)
+    df = pd.DataFrame([[0] * 600], columns=[f'colonne_{i}' for i in range(600)])
+
+    service.analyze_single_file(df=df, question='Analyse', include_charts=False, anonymize_data=False)
+
+    prompt = completions.calls[0]['messages'][-1]['content']
+    assert 'colonne_0' in prompt
+    assert 'colonne_599' not in prompt
+    assert 'colonnes)' in prompt
+
+
+def test_oversized_first_column_name_leaves_only_the_marker():
+    columns = pd.Index(['x' * (PROMPT_COLUMNS_MAX_CHARS + 1), 'b', 'c'])
+
+    assert SimpleAnalysisService._format_columns_for_prompt(columns) == '... (+3 colonnes)'
@@ -0,0 +1,62 @@
+import pytest
+
+from app.services.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_requests_within_budget_do_not_wait():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire(100)
+    limiter.acquire(100)
+
+    assert clock.sleeps == []
+
+
+def test_waits_for_request_budget_to_refill():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=100000, clock=clock, sleep=clock.sleep)
+    for _ in range(60):
+        limiter.acquire(1)
+
+    limiter.acquire(1)
+
+    assert sum(clock.sleeps) == 1.0
+
+
+def test_waits_for_token_budget_to_refill():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+    limiter.acquire(600)
+
+    limiter.acquire(300)
+
+    assert sum(clock.sleeps) == 30.0
+
+
+def test_oversized_request_is_capped_to_bucket_size():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire(10000)
+
+    assert clock.sleeps == []
+
+
+@pytest.mark.parametrize('rpm, tpm', [(0, 1000), (10, 0), (-1, 1000)])
+def test_non_positive_limits_are_rejected(rpm, tpm):
+    with pytest.raises(ValueError):
+        RateLimiter(requests_per_minute=rpm, tokens_per_minute=tpm)
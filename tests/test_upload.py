@@ -0,0 +1,46 @@
+import base64
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_oversized_upload_is_rejected(monkeypatch):
+    monkeypatch.setattr(routes.settings, 'max_file_size_mb', 1)
+    monkeypatch.setattr(routes, 'UPLOAD_READ_CHUNK_SIZE', 64 * 1024)
+    content = b'a,b\n' + b'1,2\n' * (300 * 1024)
+
+    response = client.post(
+        '/api/v1/analyze',
+        files={'files': ('big.csv', content, 'text/csv')},
+        data={'question': 'Analyse'}
+    )
+
+    assert response.status_code == 413
+
+
+def test_oversized_base64_upload_is_rejected(monkeypatch):
+    monkeypatch.setattr(routes.settings, 'max_file_size_mb', 1)
+    content = base64.b64encode(b'a,b\n' + b'1,2\n' * (300 * 1024)).decode('ascii')
+
+    response = client.post(
+        '/api/v1/analyze-base64',
+        params={'question': 'Analyse'},
+        json=[{'filename': 'big.csv', 'content': content}]
+    )
+
+    assert response.status_code == 413
+
+
+def test_csv_upload_is_parsed_and_analyzed():
+    response = client.post(
+        '/api/v1/analyze',
+        files={'files': ('data.csv', b'ville;montant\nParis;10\nLyon;20\n', 'text/csv')},
+        data={'question': 'Analyse', 'anonymize_data': 'false'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()['data_summary']['shape'] == {'rows': 2, 'columns': 2}